@@ -16,6 +16,7 @@
 import copy
 
 import tensorflow as tf
+from absl import logging
 from tensorflow import keras
 
 from keras_nlp.api_export import keras_nlp_export
@@ -25,7 +26,9 @@ from keras_nlp.models.bart.bart_seq_2_seq_lm_preprocessor import (
     BartSeq2SeqLMPreprocessor,
 )
 from keras_nlp.models.task import Task
+from keras_nlp.samplers.beam_sampler import BeamSampler
 from keras_nlp.samplers.serialization import get as get_sampler
+from keras_nlp.samplers.serialization import serialize as serialize_sampler
 from keras_nlp.utils.keras_utils import is_xla_compatible
 from keras_nlp.utils.python_utils import classproperty
 from keras_nlp.utils.tensor_utils import tensor_to_string_list
@@ -63,6 +66,11 @@ class BartSeq2SeqLM(Task):
         preprocessor: A `keras_nlp.models.BartSeq2SeqLMPreprocessor` or `None`.
             If `None`, this model will not apply preprocessing, and inputs
             should be preprocessed before calling the model.
+        low_precision_lm_head: bool. If `True`, the projection from hidden
+            states to vocabulary logits inside `generate()` is computed in
+            `bfloat16`, halving the bytes read from the (large) token
+            embedding matrix on every decoding step. Training and direct calls
+            to the model are unaffected. Defaults to `False`.
 
     Examples:
 
@@ -188,6 +196,7 @@ class BartSeq2SeqLM(Task):
         self,
         backbone,
         preprocessor=None,
+        low_precision_lm_head=False,
         **kwargs,
     ):
         inputs = backbone.input
@@ -210,8 +219,62 @@ class BartSeq2SeqLM(Task):
 
         self.backbone = backbone
         self.preprocessor = preprocessor
+        self.low_precision_lm_head = low_precision_lm_head
         self.generate_function = None
         self._sampler = None
+        self._generate_config = None
+        self._generate_max_length = None
+
+        # Cache the backbone layers used during generation, so we do not look
+        # them up by name each time `generate_step()` is traced.
+        self._token_embedding = backbone.get_layer("token_embedding")
+        self._encoder_position_embedding = backbone.get_layer(
+            "encoder_position_embedding"
+        )
+        self._encoder_embeddings_add = backbone.get_layer(
+            "encoder_embeddings_add"
+        )
+        self._encoder_embeddings_layer_norm = backbone.get_layer(
+            "encoder_embeddings_layer_norm"
+        )
+        self._encoder_embeddings_dropout = backbone.get_layer(
+            "encoder_embeddings_dropout"
+        )
+        self._encoder_layers = [
+            backbone.get_layer(f"transformer_encoder_layer_{i}")
+            for i in range(backbone.num_layers)
+        ]
+        self._decoder_position_embedding = backbone.get_layer(
+            "decoder_position_embedding"
+        )
+        self._decoder_embeddings_add = backbone.get_layer(
+            "decoder_embeddings_add"
+        )
+        self._decoder_embeddings_layer_norm = backbone.get_layer(
+            "decoder_embeddings_layer_norm"
+        )
+        self._decoder_embeddings_dropout = backbone.get_layer(
+            "decoder_embeddings_dropout"
+        )
+        self._decoder_layers = [
+            backbone.get_layer(f"transformer_decoder_layer_{i}")
+            for i in range(backbone.num_layers)
+        ]
+        # Cache the dimensions used to build the key/value caches.
+        self._num_layers = backbone.num_layers
+        self._num_heads = backbone.num_heads
+        self._head_dim = backbone.hidden_dim // backbone.num_heads
+        if (
+            self.compute_dtype in ("float16", "bfloat16")
+            and self._head_dim % 8 != 0
+        ):
+            logging.warning(
+                "The attention head size of this model "
+                f"(`hidden_dim // num_heads = {self._head_dim}`) is not a "
+                f"multiple of 8. With a `{self.compute_dtype}` compute dtype, "
+                "GPU tensor cores will not be used for the key/value cache "
+                "matmuls in `generate()`, which will be significantly slower."
+            )
 
         # Default compilation
         self.compile(
@@ -221,6 +284,15 @@ class BartSeq2SeqLM(Task):
             jit_compile=is_xla_compatible(self),
         )
 
+    def get_config(self):
+        config = super().get_config()
+        config.update(
+            {
+                "low_precision_lm_head": self.low_precision_lm_head,
+            }
+        )
+        return config
+
     @classproperty
     def presets(cls):
         return copy.deepcopy(backbone_presets)
@@ -242,6 +314,8 @@ class BartSeq2SeqLM(Task):
         self_attention_cache_update_index=None,
         cross_attention_cache=None,
         cross_attention_cache_update_index=None,
+        compute_logits=True,
+        low_precision_embeddings=None,
     ):
         """Forward pass with a key/value caches for generative decoding..
 
@@ -265,59 +339,80 @@ class BartSeq2SeqLM(Task):
             decoder_token_ids: a dense int Tensor of shape
                 `(batch_size, max_length)`. Input token ids to be fed to
                 the decoder.
-            self_attention_cache: a dense float Tensor of shape
-                `(batch_size, num_layers, 2, max_length, num_heads, key_dims)`.
+            self_attention_cache: a tuple of `num_layers` dense float Tensors,
+                each of shape `(batch_size, 2, max_length, num_heads, key_dims)`.
                 The cached key/value tensors of previously seen tokens in the
-                decoder's self-attention layer.
+                decoder's self-attention layers.
             self_attention_cache_update_index: an int or int Tensor, the index
                 at which to update the `self_attention_cache`. Usually, this is
                 the index of the current token being processed during decoding.
-            cross_attention_cache: a dense float Tensor of shape
-                `(batch_size, num_layers, 2, encoder_sequence_length, num_heads, key_dims)`.
+            cross_attention_cache: a tuple of `num_layers` dense float Tensors,
+                each of shape
+                `(batch_size, 2, encoder_sequence_length, num_heads, key_dims)`.
                 The cached key/value tensors of the encoder outputs in the
-                decoder's cross-attention layer.
+                decoder's cross-attention layers.
             cross_attention_cache_update_index: an int or int Tensor, the index
                 at which to update the `cross_attention_cache`. Usually, this is
                 either `0` (compute the entire `cross_attention_cache`), or
                 `None` (reuse a previously computed `cross_attention_cache`).
+            compute_logits: bool. Whether to project the hidden states to
+                vocabulary logits. When seeding the caches, the logits are
+                unused and this projection can be skipped. Defaults to `True`.
+            low_precision_embeddings: a `bfloat16` copy of the token embedding
+                matrix, used to compute the logits when `low_precision_lm_head`
+                is set. Pass this to cast the matrix once per call to
+                `generate()`, instead of once per decoding step. If `None`, the
+                embedding matrix is cast on each call.
 
         Returns:
             A `(logits, hidden_states, self_attention_cache, cross_attention_cache)`
             tuple, where `logits` is the language model logits for the input
-            `decoder_token_ids`, `hidden_states` is the final hidden
-            representation of the input tokens, `self_attention_cache` is the
-            key/value cache in the decoder's self-attention layer and
-            `cross_attention_cache` is the key/value cache in the decoder's
-            cross-attention layer.
+            `decoder_token_ids` (or `None` if `compute_logits` is `False`),
+            `hidden_states` is the final hidden representation of the input
+            tokens, `self_attention_cache` is the key/value cache in the
+            decoder's self-attention layer and `cross_attention_cache` is the
+            key/value cache in the decoder's cross-attention layer.
         """
         # Embedding layers.
-        token_embedding = self.backbone.get_layer("token_embedding")(
-            decoder_token_ids
+        if decoder_token_ids.shape[1] == 1:
+            # When decoding a single token per step, `keras.layers.Embedding`
+            # is just a row gather; do it directly and skip the layer call.
+            token_embedding = tf.gather(
+                self._token_embedding.embeddings, decoder_token_ids
+            )
+            token_embedding = tf.cast(token_embedding, self.compute_dtype)
+        else:
+            token_embedding = self._token_embedding(decoder_token_ids)
+        position_embedding = self._decoder_position_embedding(
+            token_embedding, start_index=self_attention_cache_update_index
         )
-        position_embedding = self.backbone.get_layer(
-            "decoder_position_embedding"
-        )(token_embedding, start_index=self_attention_cache_update_index)
 
-        # Sum, normalize and apply dropout to embeddings.
-        x = self.backbone.get_layer("decoder_embeddings_add")(
-            (token_embedding, position_embedding)
-        )
-        x = self.backbone.get_layer("decoder_embeddings_layer_norm")(x)
-        x = self.backbone.get_layer("decoder_embeddings_dropout")(x)
+        # Sum, normalize and apply dropout to embeddings. When the generate
+        # function is compiled with XLA, these are fused into a single kernel,
+        # so we do not wrap them in a separate `jit_compile` function (which
+        # would also force XLA on platforms where it is not supported).
+        x = self._decoder_embeddings_add((token_embedding, position_embedding))
+        x = self._decoder_embeddings_layer_norm(x)
+        x = self._decoder_embeddings_dropout(x)
 
         # Every decoder layer has a separate cache for the self-attention layer
         # and the cross-attention layer. We update all of them separately.
-        self_attention_caches = tf.unstack(self_attention_cache, axis=1)
-        cross_attention_caches = tf.unstack(cross_attention_cache, axis=1)
-        for i in range(self.backbone.num_layers):
-            current_self_attention_cache = self_attention_caches[i]
-            current_cross_attention_cache = cross_attention_caches[i]
-
+        # Caches are kept as a tuple of per-layer tensors, so no stack/unstack
+        # of the full cache is needed for each generated token.
+        next_self_attention_caches = []
+        next_cross_attention_caches = []
+        for (
+            decoder_layer,
+            current_self_attention_cache,
+            current_cross_attention_cache,
+        ) in zip(
+            self._decoder_layers, self_attention_cache, cross_attention_cache
+        ):
             (
                 x,
                 next_self_attention_cache,
                 next_cross_attention_cache,
-            ) = self.backbone.get_layer(f"transformer_decoder_layer_{i}")(
+            ) = decoder_layer(
                 decoder_sequence=x,
                 encoder_sequence=encoder_hidden_states,
                 encoder_padding_mask=encoder_padding_mask,
@@ -327,23 +422,32 @@ class BartSeq2SeqLM(Task):
                 cross_attention_cache_update_index=cross_attention_cache_update_index,
             )
 
-            if self_attention_cache_update_index is not None:
-                self_attention_caches[i] = next_self_attention_cache
-            if cross_attention_cache_update_index is not None:
-                cross_attention_caches[i] = next_cross_attention_cache
+            if self_attention_cache_update_index is None:
+                next_self_attention_cache = current_self_attention_cache
+            if cross_attention_cache_update_index is None:
+                next_cross_attention_cache = current_cross_attention_cache
+            next_self_attention_caches.append(next_self_attention_cache)
+            next_cross_attention_caches.append(next_cross_attention_cache)
 
-        if self_attention_cache_update_index is not None:
-            self_attention_cache = tf.stack(self_attention_caches, axis=1)
-        if cross_attention_cache_update_index is not None:
-            cross_attention_cache = tf.stack(cross_attention_caches, axis=1)
+        self_attention_cache = tuple(next_self_attention_caches)
+        cross_attention_cache = tuple(next_cross_attention_caches)
 
         hidden_states = x
 
-        logits = tf.matmul(
-            hidden_states,
-            self.backbone.get_layer("token_embedding").embeddings,
-            transpose_b=True,
-        )
+        logits = None
+        if compute_logits:
+            embeddings = self._token_embedding.embeddings
+            if self.low_precision_lm_head:
+                if low_precision_embeddings is None:
+                    low_precision_embeddings = tf.cast(embeddings, "bfloat16")
+                logits = tf.matmul(
+                    tf.cast(hidden_states, "bfloat16"),
+                    low_precision_embeddings,
+                    transpose_b=True,
+                )
+                logits = tf.cast(logits, self.compute_dtype)
+            else:
+                logits = tf.matmul(hidden_states, embeddings, transpose_b=True)
         return (
             logits,
             hidden_states,
@@ -352,26 +456,26 @@ class BartSeq2SeqLM(Task):
         )
 
     def call_encoder(self, token_ids, padding_mask):
-        """Does a forward pass on the encoder and returns the encoder output."""
+        """Does a forward pass on the encoder and returns the encoder output.
+
+        This runs once per call to `generate()`, over the full encoder
+        sequence. To run it with `bfloat16` matmuls, create the model under a
+        `"mixed_bfloat16"` dtype policy; casting the inputs alone has no effect,
+        as each layer casts its inputs back to its own compute dtype.
+        """
 
         # Embedding layers.
-        token_embedding = self.backbone.get_layer("token_embedding")(token_ids)
-        position_embedding = self.backbone.get_layer(
-            "encoder_position_embedding"
-        )(token_embedding)
+        token_embedding = self._token_embedding(token_ids)
+        position_embedding = self._encoder_position_embedding(token_embedding)
 
         # Sum, normalize and apply dropout to embeddings.
-        x = self.backbone.get_layer("encoder_embeddings_add")(
-            (token_embedding, position_embedding)
-        )
-        x = self.backbone.get_layer("encoder_embeddings_layer_norm")(x)
-        x = self.backbone.get_layer("encoder_embeddings_dropout")(x)
+        x = self._encoder_embeddings_add((token_embedding, position_embedding))
+        x = self._encoder_embeddings_layer_norm(x)
+        x = self._encoder_embeddings_dropout(x)
 
         # Transformer encoder layers.
-        for i in range(self.backbone.num_layers):
-            x = self.backbone.get_layer(f"transformer_encoder_layer_{i}")(
-                x, padding_mask=padding_mask
-            )
+        for encoder_layer in self._encoder_layers:
+            x = encoder_layer(x, padding_mask=padding_mask)
 
         return x
 
@@ -381,22 +485,27 @@ class BartSeq2SeqLM(Task):
         encoder_max_length = tf.shape(encoder_token_ids)[1]
         decoder_max_length = tf.shape(decoder_token_ids)[1]
 
-        num_layers = self.backbone.num_layers
-        num_heads = self.backbone.num_heads
-        head_dim = self.backbone.hidden_dim // self.backbone.num_heads
-
+        # Each decoder layer gets its own cache tensor. The self-attention and
+        # cross-attention caches are kept apart: they have different sequence
+        # lengths, and only the self-attention cache is updated and carried
+        # through the sampler loop on each step.
         shape = [
             batch_size,
-            num_layers,
             2,
             decoder_max_length,
-            num_heads,
-            head_dim,
+            self._num_heads,
+            self._head_dim,
         ]
-        self_attention_cache = tf.zeros(shape, dtype=self.compute_dtype)
+        self_attention_cache = tuple(
+            tf.zeros(shape, dtype=self.compute_dtype)
+            for _ in range(self._num_layers)
+        )
 
-        shape[3] = encoder_max_length
-        cross_attention_cache = tf.zeros(shape, dtype=self.compute_dtype)
+        shape[2] = encoder_max_length
+        cross_attention_cache = tuple(
+            tf.zeros(shape, dtype=self.compute_dtype)
+            for _ in range(self._num_layers)
+        )
 
         return (self_attention_cache, cross_attention_cache)
 
@@ -425,6 +534,7 @@ class BartSeq2SeqLM(Task):
             self_attention_cache_update_index=0,
             cross_attention_cache=cross_attention_cache,
             cross_attention_cache_update_index=0,
+            compute_logits=False,
         )
         return (
             hidden_states,
@@ -442,16 +552,32 @@ class BartSeq2SeqLM(Task):
         **kwargs,
     ):
         xla_compatible = is_xla_compatible(self)
+        # Only `jit_compile` if not eager and in a compatible environment.
+        jit_compile = jit_compile and xla_compatible and not run_eagerly
         super().compile(
             *args,
             run_eagerly=run_eagerly,
-            # Only `jit_compile` if not eager and in a compatible environment.
-            jit_compile=jit_compile and xla_compatible and not run_eagerly,
+            jit_compile=jit_compile,
             **kwargs,
         )
         self._sampler = get_sampler(sampler)
-        # Clear the compiled generate function.
-        self.generate_function = None
+        # Clear the compiled generate function, unless all settings that affect
+        # generation are unchanged (e.g. when recompiling to change the loss).
+        generate_config = (
+            serialize_sampler(self._sampler),
+            jit_compile,
+            run_eagerly,
+        )
+        if generate_config != self._generate_config:
+            self.generate_function = None
+            self._reset_generate_functions()
+        self._generate_config = generate_config
+
+    @tf.__internal__.tracking.no_automatic_dependency_tracking
+    def _reset_generate_functions(self):
+        # Traced generate functions, keyed by input spec. Keys are tuples, so
+        # keep the dict out of layer tracking, which needs string keys to save.
+        self._generate_functions = {}
 
     def make_generate_function(self):
         """Create or return the compiled generation function."""
@@ -464,9 +590,33 @@ class BartSeq2SeqLM(Task):
             # `jit_compile` is a property of keras.Model after TF 2.12.
             # Use `getattr()` for backwards compatibility.
             jit_compile = getattr(self, "jit_compile", True)
-            self.generate_function = tf.function(
-                self.generate_step, jit_compile=jit_compile
-            )
+
+            # Only relax the batch axis. Samplers rely on a static sequence
+            # length (e.g. to reshape beams), so we trace one function per set
+            # of input sequence lengths, each with an `input_signature` that
+            # has a `None` batch size, so batch size changes never retrace.
+            def generate_function(inputs, end_token_id=None):
+                inputs = tf.nest.map_structure(tf.convert_to_tensor, inputs)
+                if end_token_id is None:
+                    end_token_id = -1
+                end_token_id = tf.convert_to_tensor(end_token_id, "int32")
+                input_spec = tf.nest.map_structure(
+                    lambda x: tf.TensorSpec([None, *x.shape[1:]], x.dtype),
+                    inputs,
+                )
+                key = tuple(sorted(input_spec.items()))
+                if key not in self._generate_functions:
+                    self._generate_functions[key] = tf.function(
+                        self.generate_step,
+                        jit_compile=jit_compile,
+                        input_signature=[
+                            input_spec,
+                            tf.TensorSpec((), "int32"),
+                        ],
+                    )
+                return self._generate_functions[key](inputs, end_token_id)
+
+            self.generate_function = generate_function
         return self.generate_function
 
     def generate_step(
@@ -488,7 +638,8 @@ class BartSeq2SeqLM(Task):
                 `"decoder_padding_mask"`, with batched tensor values.
             end_token_id: The id of the end token to stop on. If all
                 sequences have produced a new `end_token_id`, generation
-                will stop.
+                will stop. Can be a Python int or a scalar int Tensor; a value
+                of `-1` never matches and disables early stopping.
         """
         (
             encoder_token_ids,
@@ -503,6 +654,8 @@ class BartSeq2SeqLM(Task):
         )
 
         batch_size = tf.shape(encoder_token_ids)[0]
+        if end_token_id is not None:
+            end_token_id = tf.cast(end_token_id, decoder_token_ids.dtype)
 
         # Create and seed cache with a single forward pass.
         (
@@ -514,12 +667,37 @@ class BartSeq2SeqLM(Task):
             encoder_token_ids, encoder_padding_mask, decoder_token_ids
         )
         # Compute the lengths of all user inputted tokens ids.
-        row_lengths = tf.math.reduce_sum(
-            tf.cast(decoder_padding_mask, "int32"), axis=-1
+        row_lengths = tf.math.count_nonzero(
+            decoder_padding_mask, axis=-1, dtype="int32"
         )
         # Start at the first index that has no user inputted id.
         index = tf.math.reduce_min(row_lengths)
 
+        # Beam search always calls `next` with `num_beams` copies of each
+        # sequence. Repeat the encoder outputs once here, rather than on every
+        # step of the generation loop.
+        if isinstance(self._sampler, BeamSampler):
+            (
+                encoder_hidden_states,
+                encoder_padding_mask,
+                cross_attention_cache,
+            ) = tf.nest.map_structure(
+                lambda x: tf.repeat(x, repeats=self._sampler.num_beams, axis=0),
+                (
+                    encoder_hidden_states,
+                    encoder_padding_mask,
+                    cross_attention_cache,
+                ),
+            )
+
+        # Cast the embedding matrix for the LM head once, outside the sampler
+        # loop, so each step reads only the `bfloat16` copy.
+        low_precision_embeddings = None
+        if self.low_precision_lm_head:
+            low_precision_embeddings = tf.cast(
+                self._token_embedding.embeddings, "bfloat16"
+            )
+
         def next(prompt, cache, index):
             # The cache index is the index of our previous token.
             cache_index = index - 1
@@ -528,7 +706,7 @@ class BartSeq2SeqLM(Task):
             num_samples = tf.shape(prompt)[0]
 
             def repeat_tensor(x):
-                """Repeats tensors along batch axis to match dim for beam search."""
+                """Repeats tensors along batch axis to match the samples dim."""
                 if tf.shape(x)[0] == num_samples:
                     return x
                 return tf.repeat(x, repeats=num_samples // batch_size, axis=0)
@@ -539,9 +717,14 @@ class BartSeq2SeqLM(Task):
                 decoder_token_ids=prompt,
                 self_attention_cache=cache,
                 self_attention_cache_update_index=cache_index,
-                cross_attention_cache=repeat_tensor(cross_attention_cache),
+                cross_attention_cache=tf.nest.map_structure(
+                    repeat_tensor, cross_attention_cache
+                ),
                 cross_attention_cache_update_index=None,
+                low_precision_embeddings=low_precision_embeddings,
             )
+            # Drop the length 1 sequence axis. This is only a reshape; the
+            # decoder layers need the `(batch_size, 1, hidden_dim)` inputs.
             return (
                 tf.squeeze(logits, axis=1),
                 tf.squeeze(hidden_states, axis=1),
@@ -566,10 +749,10 @@ class BartSeq2SeqLM(Task):
                 ~decoder_padding_mask
             )
             end_locations = tf.cast(end_locations, "int32")
-            # Use cumsum to get ones in all locations after `end_locations`.
+            # Use cumsum to count the `end_locations` before each position.
+            # Our padding mask is all locations not preceded by an end token.
             overflow = tf.math.cumsum(end_locations, exclusive=True, axis=-1)
-            # Our padding mask is the inverse of these overflow locations.
-            decoder_padding_mask = ~tf.cast(overflow, "bool")
+            decoder_padding_mask = overflow == 0
         else:
             # Without early stopping, all locations will have been updated.
             decoder_padding_mask = tf.ones_like(decoder_token_ids, dtype="bool")
@@ -586,8 +769,8 @@ class BartSeq2SeqLM(Task):
         """Normalizes user input to the generate function.
 
         This function converts all inputs to tensors, adds a batch dimension if
-        necessary, and returns a iterable "dataset like" object (either an
-        actual `tf.data.Dataset` or a list with a single batch element).
+        necessary, and returns either an actual `tf.data.Dataset` or a single
+        batch of inputs.
         """
         input_is_scalar = False
 
@@ -606,51 +789,59 @@ class BartSeq2SeqLM(Task):
             return x, x_is_scalar
 
         if isinstance(inputs, dict):
-            for key in inputs:
-                inputs[key], input_is_scalar = normalize(inputs[key])
+            # Don't use `tf.nest` here, it would flatten python list values.
+            # Build a new dict rather than mutating the caller's inputs.
+            normalized = {key: normalize(x) for key, x in inputs.items()}
+            inputs = {key: x for key, (x, _) in normalized.items()}
+            input_is_scalar = any(
+                x_is_scalar for _, x_is_scalar in normalized.values()
+            )
         else:
             inputs, input_is_scalar = normalize(inputs)
 
         # We avoid converting to a dataset purely for speed, for a single batch
         # of input, creating a dataset would add significant overhead.
-        return [inputs], input_is_scalar
+        return inputs, input_is_scalar
 
     def _normalize_generate_outputs(
         self,
         outputs,
         input_is_scalar,
+        return_tensors=False,
     ):
         """Normalizes user output from the generate function.
 
         This function converts the output to numpy (for integer output), or
         python strings (for string output). If a batch dimension was added to
         the input, it is removed from the output (so generate can be string in,
-        string out).
+        string out). `outputs` can either be a single batch of outputs, or a
+        list of batches (for `tf.data.Dataset` input) to be concatenated. If
+        `return_tensors` is `True`, outputs are left as `tf.Tensor`s.
         """
 
         def normalize(x):
-            x = tf.concat(x, axis=0)
+            if isinstance(x, list):
+                # Avoid a copy when there is only a single batch of outputs.
+                x = x[0] if len(x) == 1 else tf.concat(x, axis=0)
             x = tf.squeeze(x, 0) if input_is_scalar else x
+            if return_tensors:
+                return x
             is_string = x.dtype == tf.string
             # Convert outputs to a friendly pythonic type. For numerical outputs
             # that is numpy, for string outputs that is `list` and `str`.
             return tensor_to_string_list(x) if is_string else x.numpy()
 
-        if isinstance(outputs[0], dict):
-            return {
-                "decoder_token_ids": normalize(
-                    [x["decoder_token_ids"] for x in outputs]
-                ),
-                "decoder_padding_mask": normalize(
-                    [x["decoder_padding_mask"] for x in outputs]
-                ),
-            }
-        return normalize([x for x in outputs])
+        if isinstance(outputs, list) and isinstance(outputs[0], dict):
+            outputs = {key: [x[key] for x in outputs] for key in outputs[0]}
+        if isinstance(outputs, dict):
+            return {key: normalize(value) for key, value in outputs.items()}
+        return normalize(outputs)
 
     def generate(
         self,
         inputs,
         max_length=None,
+        return_tensors=False,
     ):
         """Generates text conditioned on the encoder inputs.
 
@@ -675,8 +866,16 @@ class BartSeq2SeqLM(Task):
                 specify a prompt. If a preprocessor is not attached, input
                 batches should have the same structure as when directly calling
                 the model.
-            max_length: int. The max length of generated sequence.
+            max_length: int. The max length of generated sequence. Decoder
+                inputs are padded or truncated to exactly this length before
+                generation, so the compiled generate function sees a fixed
+                shape. Keep
+                `max_length` the same across calls to avoid recompiling.
             add_start_token: bool. Whether to add the start token to `prompt`.
+            return_tensors: bool. If `True`, return outputs as `tf.Tensor`s
+                instead of converting them to numpy arrays or python strings.
+                This avoids copying the outputs to the host, e.g. when feeding
+                them into another `tf.data` pipeline. Defaults to `False`.
         """
 
         # Setup our three main passes.
@@ -684,15 +883,40 @@ class BartSeq2SeqLM(Task):
         # 2. Generate new tokens via a compiled function on dense tensors.
         # 3. Optionally postprocess dense integer tensors back to string.
         generate_function = self.make_generate_function()
-        end_token_id = None
+        if max_length is not None:
+            if self._generate_max_length not in (None, max_length):
+                logging.warning(
+                    "`max_length` changed from "
+                    f"{self._generate_max_length} to {max_length} since the "
+                    "last call to `generate()`. The generate function will be "
+                    "retraced and recompiled for the new input shape."
+                )
+            self._generate_max_length = max_length
+        # Always pass `end_token_id` as a scalar tensor (`-1` for no end token),
+        # so that attaching or detaching a preprocessor does not retrace.
+        end_token_id = -1
         if self.preprocessor is not None:
             end_token_id = self.preprocessor.tokenizer.end_token_id
+        end_token_id = tf.constant(end_token_id, dtype="int32")
 
         def preprocess(x):
             return self.preprocessor.generate_preprocess(
                 x, sequence_length=max_length
             )
 
+        def pad(x):
+            # Pad or truncate preprocessed decoder inputs to exactly
+            # `max_length`, matching the preprocessor, which also truncates
+            # longer prompts. Padded locations are masked out, and will be
+            # filled in by the sampler.
+            x = x.copy()
+            for key in ("decoder_token_ids", "decoder_padding_mask"):
+                value = x[key][:, :max_length]
+                length = tf.shape(value)[1]
+                value = tf.pad(value, [[0, 0], [0, max_length - length]])
+                x[key] = tf.ensure_shape(value, [None, max_length])
+            return x
+
         def generate(x):
             return generate_function(x, end_token_id=end_token_id)
 
@@ -702,17 +926,26 @@ class BartSeq2SeqLM(Task):
         # Normalize inputs, apply our three passes, and normalize outputs.
         inputs, input_is_scalar = self._normalize_generate_inputs(inputs)
 
-        if self.preprocessor is not None:
-            if isinstance(inputs, tf.data.Dataset):
+        if isinstance(inputs, tf.data.Dataset):
+            if self.preprocessor is not None:
                 inputs = inputs.map(preprocess, tf.data.AUTOTUNE)
                 inputs = inputs.prefetch(tf.data.AUTOTUNE)
-            else:
-                # Fast path for non-dataset, single-batch input.
-                inputs = [preprocess(x) for x in inputs]
-
-        outputs = [generate(x) for x in inputs]
-
-        if self.preprocessor is not None:
-            outputs = [postprocess(x) for x in outputs]
-
-        return self._normalize_generate_outputs(outputs, input_is_scalar)
+            elif max_length is not None:
+                inputs = inputs.map(pad, tf.data.AUTOTUNE)
+            outputs = [generate(x) for x in inputs]
+            if self.preprocessor is not None:
+                outputs = [postprocess(x) for x in outputs]
+        else:
+            # Fast path for non-dataset, single-batch input. Call the generate
+            # function once directly, without iterating a list of batches.
+            if self.preprocessor is not None:
+                inputs = preprocess(inputs)
+            elif max_length is not None:
+                inputs = pad(inputs)
+            outputs = generate(inputs)
+            if self.preprocessor is not None:
+                outputs = postprocess(outputs)
+
+        return self._normalize_generate_outputs(
+            outputs, input_is_scalar, return_tensors
+        )
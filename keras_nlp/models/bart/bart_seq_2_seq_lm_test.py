@@ -16,7 +16,6 @@
 import os
 from unittest.mock import patch
 
-import numpy as np
 import pytest
 import tensorflow as tf
 from absl.testing import parameterized
@@ -141,6 +140,61 @@ class BartSeq2SeqLMTest(tf.test.TestCase, parameterized.TestCase):
             preprocessed_batch["decoder_padding_mask"][:, :5],
         )
 
+    def test_generate_max_length_without_preprocessor(self):
+        self.seq_2_seq_lm.preprocessor = None
+        preprocessed_batch = self.preprocessor.generate_preprocess(
+            self.raw_batch
+        )
+        outputs = self.seq_2_seq_lm.generate(preprocessed_batch, max_length=12)
+        self.assertEqual(outputs["decoder_token_ids"].shape, (2, 12))
+        self.assertEqual(outputs["decoder_padding_mask"].shape, (2, 12))
+
+    def test_generate_truncates_to_max_length_without_preprocessor(self):
+        self.seq_2_seq_lm.preprocessor = None
+        preprocessed_batch = self.preprocessor.generate_preprocess(
+            self.raw_batch
+        )
+        outputs = self.seq_2_seq_lm.generate(preprocessed_batch, max_length=6)
+        self.assertEqual(outputs["decoder_token_ids"].shape, (2, 6))
+        self.assertEqual(outputs["decoder_padding_mask"].shape, (2, 6))
+        # The prompt fills the first six positions and is kept as is.
+        self.assertAllEqual(
+            outputs["decoder_token_ids"],
+            preprocessed_batch["decoder_token_ids"][:, :6],
+        )
+
+    def test_generate_return_tensors(self):
+        outputs = self.seq_2_seq_lm.generate(
+            self.raw_batch, return_tensors=True
+        )
+        self.assertIsInstance(outputs, tf.Tensor)
+        self.assertEqual(outputs.dtype, tf.string)
+
+        self.seq_2_seq_lm.preprocessor = None
+        preprocessed_batch = self.preprocessor.generate_preprocess(
+            self.raw_batch
+        )
+        outputs = self.seq_2_seq_lm.generate(
+            preprocessed_batch, return_tensors=True
+        )
+        self.assertIsInstance(outputs["decoder_token_ids"], tf.Tensor)
+        self.assertIsInstance(outputs["decoder_padding_mask"], tf.Tensor)
+
+    def test_generate_dict_with_scalar_first_key(self):
+        # Only the first key is a scalar, the last key is already batched.
+        inputs = {
+            "encoder_text": " airplane at airport",
+            "decoder_text": [" kohli is the best"],
+        }
+        original_inputs = dict(inputs)
+        output = self.seq_2_seq_lm.generate(inputs)
+        # The batch dimension we added is removed from the output.
+        self.assertIsInstance(output, str)
+        # The caller's inputs are not modified.
+        self.assertEqual(inputs, original_inputs)
+        self.assertIsInstance(inputs["encoder_text"], str)
+        self.assertIsInstance(inputs["decoder_text"], list)
+
     def test_generate_string_in_string_out(self):
         # String input.
         inputs = " airplane at airport"
@@ -171,8 +225,18 @@ class BartSeq2SeqLMTest(tf.test.TestCase, parameterized.TestCase):
                 self_attention_cache,
                 cross_attention_cache,
             ) = call_decoder_with_cache(*args, **kwargs)
-            logits = np.zeros(logits.shape.as_list())
-            logits[:, :, self.preprocessor.tokenizer.end_token_id] = 1.0e9
+            # Logits are not computed when seeding the cache. The batch size
+            # is symbolic when traced, so build the mock from the dynamic shape.
+            if logits is not None:
+                logits = tf.one_hot(
+                    tf.fill(
+                        tf.shape(logits)[:-1],
+                        self.preprocessor.tokenizer.end_token_id,
+                    ),
+                    tf.shape(logits)[-1],
+                    on_value=1.0e9,
+                    dtype=logits.dtype,
+                )
             return (
                 logits,
                 hidden_states,
@@ -206,6 +270,72 @@ class BartSeq2SeqLMTest(tf.test.TestCase, parameterized.TestCase):
         seq_2_seq_lm.compile(sampler="beam")
         seq_2_seq_lm.generate(self.raw_batch)
 
+    def test_low_precision_lm_head(self):
+        seq_2_seq_lm = BartSeq2SeqLM(
+            backbone=self.backbone,
+            preprocessor=self.preprocessor,
+            low_precision_lm_head=True,
+        )
+        self.assertIsInstance(seq_2_seq_lm.generate(self.raw_batch)[0], str)
+        self.assertTrue(seq_2_seq_lm.get_config()["low_precision_lm_head"])
+
+    def test_low_precision_lm_head_logits(self):
+        low_precision_lm = BartSeq2SeqLM(
+            backbone=self.backbone,
+            low_precision_lm_head=True,
+        )
+        inputs = self.preprocessed_batch
+
+        def compute_logits(seq_2_seq_lm):
+            encoder_hidden_states = seq_2_seq_lm.call_encoder(
+                inputs["encoder_token_ids"], inputs["encoder_padding_mask"]
+            )
+            (
+                self_attention_cache,
+                cross_attention_cache,
+            ) = seq_2_seq_lm._initialize_cache(
+                inputs["encoder_token_ids"], inputs["decoder_token_ids"]
+            )
+            logits, _, _, _ = seq_2_seq_lm.call_decoder_with_cache(
+                encoder_hidden_states=encoder_hidden_states,
+                encoder_padding_mask=inputs["encoder_padding_mask"],
+                decoder_token_ids=inputs["decoder_token_ids"],
+                self_attention_cache=self_attention_cache,
+                self_attention_cache_update_index=0,
+                cross_attention_cache=cross_attention_cache,
+                cross_attention_cache_update_index=0,
+            )
+            return logits
+
+        # Both models share a backbone, so only the LM head precision differs.
+        self.assertAllClose(
+            compute_logits(self.seq_2_seq_lm),
+            compute_logits(low_precision_lm),
+            atol=1e-2,
+            rtol=1e-2,
+        )
+
+    def test_head_dim_warning_mixed_bfloat16(self):
+        original_policy = keras.mixed_precision.global_policy()
+        try:
+            keras.mixed_precision.set_global_policy("mixed_bfloat16")
+            # `hidden_dim // num_heads = 2` is not a multiple of 8.
+            backbone = BartBackbone(
+                vocabulary_size=self.preprocessor.tokenizer.vocabulary_size(),
+                num_layers=2,
+                num_heads=2,
+                hidden_dim=4,
+                intermediate_dim=8,
+                max_sequence_length=12,
+            )
+            with self.assertLogs(logger="absl", level="WARNING") as logs:
+                BartSeq2SeqLM(backbone=backbone)
+        finally:
+            keras.mixed_precision.set_global_policy(original_policy)
+        self.assertTrue(
+            any("not a multiple of 8" in line for line in logs.output)
+        )
+
     def test_generate_compilation(self):
         # Assert we do not recompile with successive calls.
         self.seq_2_seq_lm.generate(self.raw_batch)
@@ -216,6 +346,59 @@ class BartSeq2SeqLMTest(tf.test.TestCase, parameterized.TestCase):
         # Assert we do recompile after compile is called.
         self.seq_2_seq_lm.compile(sampler="greedy")
         self.assertIsNone(self.seq_2_seq_lm.generate_function)
+        # Assert we do not recompile if the generation settings are unchanged.
+        self.seq_2_seq_lm.generate(self.raw_batch)
+        first_fn = self.seq_2_seq_lm.generate_function
+        self.seq_2_seq_lm.compile(sampler="greedy")
+        second_fn = self.seq_2_seq_lm.generate_function
+        self.assertEqual(first_fn, second_fn)
+
+    def test_generate_compilation_without_preprocessor(self):
+        # Assert we do not retrace when the end token changes.
+        self.seq_2_seq_lm.generate(self.raw_batch)
+        preprocessed_batch = self.preprocessor.generate_preprocess(
+            self.raw_batch
+        )
+        self.seq_2_seq_lm.preprocessor = None
+        self.seq_2_seq_lm.generate(preprocessed_batch)
+        compiled_functions = self.seq_2_seq_lm._generate_functions
+        self.assertLen(compiled_functions, 1)
+        for fn in compiled_functions.values():
+            self.assertEqual(fn.experimental_get_tracing_count(), 1)
+
+    def test_generate_compilation_batch_size(self):
+        # Assert we do not retrace for varying batch sizes.
+        self.seq_2_seq_lm.generate(self.raw_batch)
+        self.seq_2_seq_lm.generate(" airplane at airport")
+        self.seq_2_seq_lm.generate([" airplane at airport"] * 3)
+        compiled_functions = self.seq_2_seq_lm._generate_functions
+        self.assertLen(compiled_functions, 1)
+        for fn in compiled_functions.values():
+            self.assertEqual(fn.experimental_get_tracing_count(), 1)
+
+    def test_generate_compilation_max_length_beam(self):
+        # Beam search needs static sequence lengths. Assert changing
+        # `max_length` traces a new function instead of relaxing the shape.
+        seq_2_seq_lm = BartSeq2SeqLM(
+            backbone=self.backbone,
+            preprocessor=self.preprocessor,
+        )
+        seq_2_seq_lm.compile(sampler="beam")
+        seq_2_seq_lm.generate(self.raw_batch, max_length=8)
+        seq_2_seq_lm.generate(self.raw_batch, max_length=12)
+        outputs = seq_2_seq_lm.generate(
+            [" airplane at airport"] * 3, max_length=8
+        )
+        self.assertIsInstance(outputs[0], str)
+        compiled_functions = seq_2_seq_lm._generate_functions
+        self.assertLen(compiled_functions, 2)
+
+        seq_2_seq_lm.preprocessor = None
+        preprocessed_batch = self.preprocessor.generate_preprocess(
+            self.raw_batch
+        )
+        outputs = seq_2_seq_lm.generate(preprocessed_batch, max_length=11)
+        self.assertEqual(outputs["decoder_token_ids"].shape, (2, 11))
 
     def test_serialization(self):
         new_seq_2_seq_lm = keras.utils.deserialize_keras_object(
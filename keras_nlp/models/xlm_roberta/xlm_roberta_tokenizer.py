@@ -102,50 +102,50 @@ class XLMRobertaTokenizer(SentencePieceTokenizer):
         self.unk_token_id = 3  # <unk>
         self.mask_token_id = self.vocabulary_size() - 1  # <mask>
 
+        # Python lookup tables for the vocabulary, built lazily on first use.
+        self._vocabulary = None
+        self._token_to_id_map = None
+
     def vocabulary_size(self):
         """Get the size of the tokenizer vocabulary."""
         return super().vocabulary_size() + 2
 
-    def get_vocabulary(self):
-        """Get the size of the tokenizer vocabulary."""
+    def _build_vocabulary_lookups(self):
+        # Each sentencepiece lookup is a separate TF op call, so build python
+        # lookup tables once and serve all later queries from them.
+        if self._vocabulary is not None:
+            return
         vocabulary = tensor_to_string_list(
             self._sentence_piece.id_to_string(
                 tf.range(super().vocabulary_size())
             )
         )
-        return self._vocabulary_prefix + vocabulary[3:] + ["<mask>"]
+        self._vocabulary = self._vocabulary_prefix + vocabulary[3:]
+        self._vocabulary.append("<mask>")
+        # `<mask>` is not a sentencepiece token, so it maps to `<unk>`.
+        self._token_to_id_map = {
+            token: i for i, token in enumerate(self._vocabulary[:-1])
+        }
+
+    def get_vocabulary(self):
+        """Get the size of the tokenizer vocabulary."""
+        self._build_vocabulary_lookups()
+        return list(self._vocabulary)
 
     def id_to_token(self, id):
         """Convert an integer id to a string token."""
-
-        if id == self.mask_token_id:
-            return "<mask>"
-
-        if id < len(self._vocabulary_prefix) and id >= 0:
-            return self._vocabulary_prefix[id]
-
-        if id - 1 >= super().vocabulary_size() or id - 1 < 0:
+        self._build_vocabulary_lookups()
+        if id >= len(self._vocabulary) or id < 0:
             raise ValueError(
                 f"`id` must be in range [0, {self.vocabulary_size() - 1}]. "
                 f"Received: {id}"
             )
-
-        return tensor_to_string_list(self._sentence_piece.id_to_string(id - 1))
+        return self._vocabulary[id]
 
     def token_to_id(self, token):
         """Convert a string token to an integer id."""
-
-        if token in self._vocabulary_prefix:
-            return self._vocabulary_prefix.index(token)
-
-        spm_token_id = self._sentence_piece.string_to_id(token)
-
-        # OOV token
-        spm_unk_token_id = self._sentence_piece.string_to_id("<unk>")
-        if spm_token_id == spm_unk_token_id:
-            return self.unk_token_id
-
-        return int(spm_token_id.numpy()) + 1
+        self._build_vocabulary_lookups()
+        return self._token_to_id_map.get(token, self.unk_token_id)
 
     def tokenize(self, inputs):
         tokens = super().tokenize(inputs)
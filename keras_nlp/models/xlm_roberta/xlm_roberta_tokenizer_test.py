@@ -14,11 +14,9 @@
 
 """Tests for XLM-RoBERTa tokenizer."""
 
-import io
 import os
 
 import pytest
-import sentencepiece
 import tensorflow as tf
 from absl.testing import parameterized
 from tensorflow import keras
@@ -26,25 +24,12 @@ from tensorflow import keras
 from keras_nlp.models.xlm_roberta.xlm_roberta_tokenizer import (
     XLMRobertaTokenizer,
 )
+from keras_nlp.tests.xlmr_fixtures import xlmr_proto
 
 
 class XLMRobertaTokenizerTest(tf.test.TestCase, parameterized.TestCase):
     def setUp(self):
-        bytes_io = io.BytesIO()
-        vocab_data = tf.data.Dataset.from_tensor_slices(
-            ["the quick brown fox", "the earth is round"]
-        )
-        sentencepiece.SentencePieceTrainer.train(
-            sentence_iterator=vocab_data.as_numpy_iterator(),
-            model_writer=bytes_io,
-            vocab_size=10,
-            model_type="WORD",
-            unk_id=0,
-            bos_id=1,
-            eos_id=2,
-        )
-        self.proto = bytes_io.getvalue()
-
+        self.proto = xlmr_proto()
         self.tokenizer = XLMRobertaTokenizer(proto=self.proto)
 
     def test_tokenize(self):
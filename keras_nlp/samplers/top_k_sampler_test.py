@@ -18,45 +18,52 @@ from absl.testing import parameterized
 
 from keras_nlp.samplers.top_k_sampler import TopKSampler
 
+# Use a simple alphabet of lowercase characters to [0, 26).
+INT_LOOKUP = {i: chr(i + ord("a")) for i in range(26)}
+CHAR_LOOKUP = {v: k for k, v in INT_LOOKUP.items()}
+
 
 class TopKSamplerTest(tf.test.TestCase, parameterized.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.batch_size = 1
+        cls.length = 12
+        # All tests start from the same all "z" prompt.
+        cls.z_prompt = tf.fill((cls.batch_size, cls.length), CHAR_LOOKUP["z"])
+
     def setUp(self):
         super().setUp()
-        # Use a simple alphabet of lowercase characters to [0, 26).
-        self.int_lookup = {i: chr(i + ord("a")) for i in range(26)}
-        self.char_lookup = {v: k for k, v in self.int_lookup.items()}
-        self.batch_size = 1
-        self.length = 12
+        self.int_lookup = INT_LOOKUP
+        self.char_lookup = CHAR_LOOKUP
+        self.char_table = tf.constant(list(self.int_lookup.values()))
         self.vocab_size = len(self.int_lookup)
+        # Dummy hidden states, shared by all `next` functions.
+        self.hidden_states = tf.ones([self.batch_size, 5])
 
         def next(prompt, cache, index):
-            # Dummy hidden states.
-            hidden_states = tf.ones([self.batch_size, 5])
             # Return a distribution favoring the next char in cache.
-            logits = tf.one_hot(cache[:, index], self.vocab_size) * 1e9
-            return logits, hidden_states, cache
+            logits = tf.one_hot(cache[:, index], self.vocab_size, on_value=1e9)
+            return logits, self.hidden_states, cache
 
         self.next = next
         self.sampler = TopKSampler(k=5, temperature=1.0)
 
     def join_as_string(self, x):
-        return ["".join([self.int_lookup[i] for i in s]) for s in x.numpy()]
+        strings = tf.strings.reduce_join(tf.gather(self.char_table, x), axis=-1)
+        return [s.decode("utf-8") for s in strings.numpy()]
 
     def test_stateless_call(self):
         def next(prompt, cache, index):
-            # Dummy hidden states.
-            hidden_states = tf.ones([self.batch_size, 5])
             # Return a distribution favoring the first token in the vocab.
-            logits = (
-                tf.one_hot(
-                    tf.zeros(self.batch_size, dtype="int32"),
-                    self.vocab_size,
-                )
-                * 1e9
+            logits = tf.one_hot(
+                tf.zeros(self.batch_size, dtype="int32"),
+                self.vocab_size,
+                on_value=1e9,
             )
-            return logits, hidden_states, cache
+            return logits, self.hidden_states, cache
 
-        prompt = tf.fill((self.batch_size, self.length), self.char_lookup["z"])
+        prompt = self.z_prompt
         output = self.sampler(
             next=next,
             prompt=prompt,
@@ -67,7 +74,7 @@ class TopKSamplerTest(tf.test.TestCase, parameterized.TestCase):
     def test_stateful_call(self):
         cache_chars = list("sequentially")
         cache = tf.constant([[self.char_lookup[c] for c in cache_chars]])
-        prompt = tf.fill((self.batch_size, self.length), self.char_lookup["z"])
+        prompt = self.z_prompt
         output = self.sampler(
             next=self.next,
             prompt=prompt,
@@ -78,7 +85,7 @@ class TopKSamplerTest(tf.test.TestCase, parameterized.TestCase):
     def test_early_stopping(self):
         cache_chars = list("sequentially")
         cache = tf.constant([[self.char_lookup[c] for c in cache_chars]])
-        prompt = tf.fill((self.batch_size, self.length), self.char_lookup["z"])
+        prompt = self.z_prompt
         output = self.sampler(
             next=self.next,
             prompt=prompt,
@@ -88,15 +95,15 @@ class TopKSamplerTest(tf.test.TestCase, parameterized.TestCase):
         self.assertEqual(self.join_as_string(output), ["sequentzzzzz"])
 
     def test_outputs_in_top_k(self):
+        # Return a distribution where each id is progressively less likely.
+        # The logits do not depend on the inputs, so build them once.
+        logits = tf.range(self.vocab_size, 0, -1, dtype="float32")
+        logits = tf.repeat(logits[tf.newaxis, :], self.batch_size, axis=0)
+
         def next(prompt, cache, index):
-            # Dummy hidden states.
-            hidden_states = tf.ones([self.batch_size, 5])
-            # Return a distribution where each id is progressively less likely.
-            logits = tf.range(self.vocab_size, 0, -1, dtype="float32")
-            logits = tf.repeat(logits[tf.newaxis, :], self.batch_size, axis=0)
-            return logits, hidden_states, cache
-
-        prompt = tf.fill((self.batch_size, self.length), self.char_lookup["z"])
+            return logits, self.hidden_states, cache
+
+        prompt = self.z_prompt
         output = self.sampler(
             next=next,
             prompt=prompt,
@@ -110,9 +117,11 @@ class TopKSamplerTest(tf.test.TestCase, parameterized.TestCase):
     def test_compilation(self, jit_compile):
         cache_chars = list("sequentially")
         cache = tf.constant([[self.char_lookup[c] for c in cache_chars]])
-        prompt = tf.fill((self.batch_size, self.length), self.char_lookup["z"])
+        prompt = self.z_prompt
+
+        spec = tf.TensorSpec((self.batch_size, self.length), "int32")
 
-        @tf.function(jit_compile=jit_compile)
+        @tf.function(jit_compile=jit_compile, input_signature=[spec, spec])
         def generate(prompt, cache):
             return self.sampler(self.next, prompt=prompt, cache=cache)
 
@@ -0,0 +1,40 @@
+# Copyright 2023 The KerasNLP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared test fixtures for XLM-RoBERTa."""
+
+import functools
+import io
+
+import sentencepiece
+
+
+@functools.lru_cache(maxsize=1)
+def xlmr_proto():
+    """Return a tiny sentencepiece proto for XLM-RoBERTa tests.
+
+    Training is slow relative to the tests themselves, so the proto is
+    trained once per process and shared by all test classes.
+    """
+    bytes_io = io.BytesIO()
+    vocab_data = ["the quick brown fox", "the earth is round"]
+    sentencepiece.SentencePieceTrainer.train(
+        sentence_iterator=iter(vocab_data),
+        model_writer=bytes_io,
+        vocab_size=10,
+        model_type="WORD",
+        unk_id=0,
+        bos_id=1,
+        eos_id=2,
+    )
+    return bytes_io.getvalue()